@@ -5,11 +5,23 @@ with custom tools for web search and strategic thinking.
 """
 
 from research_agent.prompts import (
+    CURRENT_DATE_INSTRUCTIONS,
     RESEARCHER_INSTRUCTIONS,
     RESEARCH_WORKFLOW_INSTRUCTIONS,
     SUBAGENT_DELEGATION_INSTRUCTIONS,
+    build_orchestrator_instructions,
+    build_researcher_instructions,
 )
-from research_agent.tools import tavily_search, think_tool
+
+
+def __getattr__(name: str):
+    """Import the tools on first access so prompt-only imports stay light."""
+    if name in ("tavily_search", "think_tool"):
+        from research_agent import tools
+
+        return getattr(tools, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "tavily_search",
@@ -17,4 +29,7 @@ __all__ = [
     "RESEARCHER_INSTRUCTIONS",
     "RESEARCH_WORKFLOW_INSTRUCTIONS",
     "SUBAGENT_DELEGATION_INSTRUCTIONS",
+    "CURRENT_DATE_INSTRUCTIONS",
+    "build_orchestrator_instructions",
+    "build_researcher_instructions",
 ]
@@ -0,0 +1,89 @@
+"""Agent Middleware.
+
+This module provides middleware for the research sub-agents, bounding how many
+tokens a single delegated task may spend before it must report back.
+"""
+
+from collections.abc import Awaitable, Callable
+
+from langchain.agents.middleware import AgentMiddleware, ModelRequest, ModelResponse
+from langchain_core.messages import AIMessage, HumanMessage
+
+BUDGET_EXHAUSTED_MESSAGE = (
+    "Your token budget for this task is exhausted. Do not call any more tools; "
+    "write your final findings now using what you have gathered."
+)
+
+
+class TokenBudgetMiddleware(AgentMiddleware):
+    """Stop tool use once a sub-agent's token budget is nearly spent.
+
+    Before each model call, the input/output tokens already spent in the run are
+    summed from the ``usage_metadata`` of earlier AI messages. If the next call
+    is expected to exceed either budget, that call is made with tool calls
+    disabled and an instruction to conclude, so the sub-agent returns its findings
+    instead of starting another search round. The tools stay bound, which keeps
+    the cached prompt prefix intact and lets providers accept the earlier tool
+    messages. The state is read from the request on every call, so one instance
+    can serve concurrent sub-agent runs.
+    """
+
+    def __init__(self, max_input_tokens: int, max_output_tokens: int) -> None:
+        """Initialize the middleware.
+
+        Args:
+            max_input_tokens: Input tokens a single run may spend across all calls
+            max_output_tokens: Output tokens a single run may spend across all calls
+        """
+        super().__init__()
+        self.max_input_tokens = max_input_tokens
+        self.max_output_tokens = max_output_tokens
+
+    def _budget_exhausted(self, request: ModelRequest) -> bool:
+        calls = [
+            m.usage_metadata
+            for m in request.messages
+            if isinstance(m, AIMessage) and m.usage_metadata
+        ]
+        if not calls:
+            return False
+        input_used = sum(u["input_tokens"] for u in calls)
+        output_used = sum(u["output_tokens"] for u in calls)
+        # The next call re-sends at least the previous input, plus an average answer
+        next_input = calls[-1]["input_tokens"]
+        next_output = output_used // len(calls)
+        return (
+            input_used + next_input > self.max_input_tokens
+            or output_used + next_output > self.max_output_tokens
+        )
+
+    def _conclude(self, request: ModelRequest) -> ModelRequest:
+        # ChatAnthropic reads any other string as the name of a tool to force
+        if getattr(request.model, "_llm_type", None) == "anthropic-chat":
+            tool_choice: dict[str, str] | str = {"type": "none"}
+        else:
+            tool_choice = "none"
+        return request.override(
+            tool_choice=tool_choice,
+            messages=[*request.messages, HumanMessage(content=BUDGET_EXHAUSTED_MESSAGE)],
+        )
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> ModelResponse:
+        """Disable tool calls for the model call once the budget is exhausted."""
+        if self._budget_exhausted(request):
+            request = self._conclude(request)
+        return handler(request)
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        """Disable tool calls for the model call once the budget is exhausted."""
+        if self._budget_exhausted(request):
+            request = self._conclude(request)
+        return await handler(request)
@@ -0,0 +1,72 @@
+"""Prompt Cache Monitoring.
+
+This module provides a callback handler that reports how much of each model
+request was served from the provider's prompt cache, so silent prefix breaks
+(usually caused by editing the prompts or tools) show up in the logs.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+logger = logging.getLogger(__name__)
+
+
+class PromptCacheMonitor(BaseCallbackHandler):
+    """Log per-call prompt cache hits and warn when the rolling hit ratio drops.
+
+    Reads the standardized ``usage_metadata`` of each chat response, which
+    carries ``input_token_details.cache_read`` for both OpenAI and Anthropic.
+    Responses replayed from the LangChain LLM cache never reach the provider,
+    so they are left out of the ratio. The warning fires once when the ratio
+    drops below the threshold and again only after it has recovered.
+    """
+
+    def __init__(self, window: int = 20, min_hit_ratio: float = 0.5) -> None:
+        """Initialize the monitor.
+
+        Args:
+            window: Number of recent calls the rolling hit ratio covers
+            min_hit_ratio: Warn when cached/total input tokens falls below this
+        """
+        self.window = window
+        self.min_hit_ratio = min_hit_ratio
+        self._calls: deque[tuple[int, int]] = deque(maxlen=window)
+        self._below_threshold = False
+        self._lock = threading.Lock()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        """Record the cache usage of a finished model call."""
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                # langchain-core adds a zeroed total_cost to LLM cache replays
+                if usage and "total_cost" not in usage:
+                    self._record(
+                        usage.get("input_token_details", {}).get("cache_read", 0),
+                        usage.get("input_tokens", 0),
+                    )
+
+    def _record(self, cached: int, total: int) -> None:
+        logger.info("cache_hit=%s/%s", cached, total)
+        with self._lock:
+            self._calls.append((cached, total))
+            if len(self._calls) < self.window:
+                return
+            window_cached = sum(c for c, _ in self._calls)
+            window_total = sum(t for _, t in self._calls)
+            below = bool(window_total) and window_cached / window_total < self.min_hit_ratio
+            crossed = below and not self._below_threshold
+            self._below_threshold = below
+        if crossed:
+            logger.warning(
+                "Prompt cache hit ratio %.0f%% over the last %s calls is below %.0f%%; "
+                "check recent prompt or tool changes for prefix breaks",
+                100 * window_cached / window_total,
+                self.window,
+                100 * self.min_hit_ratio,
+            )
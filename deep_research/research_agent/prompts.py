@@ -1,5 +1,7 @@
 """Prompt templates and tool descriptions for the research deepagent."""
 
+from functools import cache
+
 RESEARCH_WORKFLOW_INSTRUCTIONS = """# Research Workflow
 
 Follow this workflow for all research requests:
@@ -8,7 +10,7 @@ Follow this workflow for all research requests:
 2. **Save the request**: Use write_file() to save the user's research question to `./research_req.txt`
 3. **Research**: Delegate research tasks to sub-agents using the task() tool - ALWAYS use sub-agents for research, never conduct research yourself
 4. **Synthesize**: Review all sub-agent findings and consolidate citations (each unique URL gets one number across all findings)
-5. Write Radar: Write the final Tech Radar to `./final_report.md` following the Tech Radar Workflow exactly (see Report Writing Guidelines below)
+5. **Write Radar**: Write the final Tech Radar to `./final_report.md` (see Report Writing Guidelines below)
 6. **Verify**: Read `./research_req.txt` and confirm you've addressed all aspects with proper citations and structure
 
 ## Research Planning Guidelines
@@ -19,35 +21,7 @@ Follow this workflow for all research requests:
 
 ## Report Writing Guidelines
 
-When writing the final report to `./final.md`, follow these structure patterns:
-
-**For comparisons:**
-1. Introduction
-2. Overview of topic A
-3. Overview of topic B
-4. Detailed comparison
-5. Conclusion
-
-**For lists/rankings:**
-Simply list items with details - no introduction needed:
-1. Item 1 with explanation
-2. Item 2 with explanation
-3. Item 3 with explanation
-
-**For summaries/overviews:**
-1. Overview of topic
-2. Key concept 1
-3. Key concept 2
-4. Key concept 3
-5. Conclusion
-
-**General guidelines:**
-- Use clear section headings (## for sections, ### for subsections)
-- Write in paragraph form by default - be text-heavy, not just bullet points
-- Do NOT use self-referential language ("I found...", "I researched...")
-- Write as a professional report without meta-commentary
-- Each section should be comprehensive and detailed
-- Use bullet points only when listing is more appropriate than prose
+The final report is the Tech Radar defined in PHASE 2 below - write it to `./final_report.md` without self-referential language ("I found...", "I researched...").
 
 **Citation format:**
 - Cite sources inline using [1], [2], [3] format
@@ -77,7 +51,6 @@ PHASE 1 — RESEARCH (FACTUAL, NO DECISIONS)
 ================================================================================
 
 You are a research assistant conducting research on the user's input topic.
-For context, today's date is {date}.
 
 <Task>
 Your job is to use tools to gather factual, cited information about the user's
@@ -121,6 +94,7 @@ When concluding Phase 1:
 - Cite sources inline using [1], [2], [3]
 - Include a ### Sources section with titles and URLs
 - Focus on facts, adoption signals, risks, and ecosystem maturity
+- Be brief: at most 10 lines of key facts/metrics and 5 lines of risk signals
 - Each Tech Radar MUST contain at least one entry in Adopt, Trial, and Assess. Hold may be empty only if justified.
 </Research Output Expectations>
 
@@ -184,17 +158,22 @@ call the tool `write_markdown_file` with:
 Formatting rules:
 - Use clear section headings (##, ###)
 - Keep entries concise and structured
-- Cite sources using [1], [2], [3] inline
-- End with a ### Sources section listing each unique URL
+- Cite sources as described in Research Output Expectations
 
 The final output must be suitable for direct conversion into PDF or DOCX.
 
 """
 
+SECTION_DIVIDER = "\n\n" + "=" * 80 + "\n\n"
+
+CURRENT_DATE_INSTRUCTIONS = """For context, today's date is {date}."""
+
 TASK_DESCRIPTION_PREFIX = """Delegate a task to a specialized sub-agent with isolated context. Available agents for delegation are:
 {other_agents}
 """
 
+# Placeholders are kept in the trailing "Limits" section so that tuning them
+# leaves everything above byte-identical for provider prompt caching.
 SUBAGENT_DELEGATION_INSTRUCTIONS = """# Sub-Agent Research Coordination
 
 Your role is to coordinate research by delegating tasks from your TODO list to specialized research sub-agents.
@@ -222,12 +201,66 @@ Your role is to coordinate research by delegating tasks from your TODO list to s
 - **Avoid premature decomposition**: Don't break "research X" into "research X overview", "research X techniques", "research X applications" - just use 1 sub-agent for all of X
 - **Parallelize only for clear comparisons**: Use multiple sub-agents when comparing distinct entities or geographically separated data
 
-## Parallel Execution Limits
-- Use at most {max_concurrent_research_units} parallel sub-agents per iteration
+## Parallel Execution
 - Make multiple task() calls in a single response to enable parallel execution
+- Emit ALL task() calls for an iteration in a single assistant message; never emit a task() call in isolation if more are planned
 - Each sub-agent returns findings independently
 
-## Research Limits
-- Stop after {max_researcher_iterations} delegation rounds if you haven't found adequate sources
+## Stopping Criteria
 - Stop when you have sufficient information to answer comprehensively
-- Bias towards focused research over exhaustive exploration"""
\ No newline at end of file
+- Bias towards focused research over exhaustive exploration
+
+## Limits
+- Use at most {max_concurrent_research_units} parallel sub-agents per iteration
+- Stop after {max_researcher_iterations} delegation rounds if you haven't found adequate sources
+- Each sub-agent may spend at most {max_subagent_input_tokens} input and {max_subagent_output_tokens} output tokens, and must report back once that budget runs out - scope each task so it fits"""
+
+
+@cache
+def build_orchestrator_instructions(
+    max_concurrent_research_units: int,
+    max_researcher_iterations: int,
+    max_subagent_input_tokens: int,
+    max_subagent_output_tokens: int,
+) -> str:
+    """Render the orchestrator instructions once per set of limits.
+
+    Args:
+        max_concurrent_research_units: Maximum parallel sub-agents per iteration
+        max_researcher_iterations: Maximum delegation rounds
+        max_subagent_input_tokens: Input token budget of a single sub-agent task
+        max_subagent_output_tokens: Output token budget of a single sub-agent task
+
+    Returns:
+        The full orchestrator system prompt
+    """
+    # Combine orchestrator instructions (RESEARCHER_INSTRUCTIONS only for sub-agents)
+    return "".join(
+        (
+            # 1. How research should be conducted
+            RESEARCH_WORKFLOW_INSTRUCTIONS,
+            RESEARCHER_INSTRUCTIONS,
+            SECTION_DIVIDER,
+            # 2. How sub-agents should be used
+            SUBAGENT_DELEGATION_INSTRUCTIONS.format(
+                max_concurrent_research_units=max_concurrent_research_units,
+                max_researcher_iterations=max_researcher_iterations,
+                max_subagent_input_tokens=max_subagent_input_tokens,
+                max_subagent_output_tokens=max_subagent_output_tokens,
+            ),
+        )
+    )
+
+
+@cache
+def build_researcher_instructions(date: str) -> str:
+    """Render the research sub-agent instructions once per date.
+
+    Args:
+        date: Current date as YYYY-MM-DD
+
+    Returns:
+        The research sub-agent system prompt
+    """
+    # The date goes last so the static instructions stay a byte-stable prefix
+    return RESEARCHER_INSTRUCTIONS + CURRENT_DATE_INSTRUCTIONS.format(date=date)
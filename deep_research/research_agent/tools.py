@@ -4,18 +4,238 @@ This module provides search and content processing utilities for the research ag
 using Tavily for URL discovery and fetching full webpage content.
 """
 
+import atexit
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+
 import httpx
-from langchain_core.tools import InjectedToolArg, tool
+from langchain_core.outputs import Generation
+from langchain_core.tools import BaseTool, InjectedToolArg, tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from markdownify import markdownify
 from tavily import TavilyClient
 from typing_extensions import Annotated, Literal
 
-tavily_client = TavilyClient()
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _tavily_client() -> TavilyClient:
+    """Return the shared Tavily client, created on first use.
+
+    Deferring construction keeps this module importable before the
+    ``TAVILY_API_KEY`` environment variable has been loaded.
+    """
+    return TavilyClient()
+
+
+@lru_cache(maxsize=1)
+def _semantic_search_cache():
+    """Return the Redis semantic cache for search queries, or None when disabled.
+
+    Setting ``SEMANTIC_CACHE_REDIS_URL`` lets paraphrased queries (cosine
+    similarity >= 0.90) reuse earlier search results for an hour. Leave it unset
+    for freshness-critical research. If the cache cannot be created, a warning is
+    logged and searches run live for the rest of the process.
+    """
+    redis_url = os.getenv("SEMANTIC_CACHE_REDIS_URL")
+    if not redis_url:
+        return None
+
+    try:
+        # Optional dependency: install with `uv sync --extra semantic-cache`
+        from langchain_openai import OpenAIEmbeddings
+        from langchain_redis import RedisSemanticCache  # type: ignore[import-not-found]
+
+        return RedisSemanticCache(
+            embeddings=OpenAIEmbeddings(),
+            redis_url=redis_url,
+            distance_threshold=0.1,
+            ttl=60 * 60,
+            name="tavily_search",
+            prefix="tavily_search",
+        )
+    except Exception:
+        # Returning None caches the failure, so Redis is not retried on every search
+        logger.warning("Semantic search cache disabled", exc_info=True)
+        return None
+
+
+def _cached_search(search_cache, query: str, scope: str) -> str | None:
+    """Return a cached search response, or None on a miss or cache failure."""
+    try:
+        hit = search_cache.lookup(query, scope)
+    except Exception:
+        logger.warning("Semantic search cache lookup failed", exc_info=True)
+        return None
+    return hit[0].text if hit else None
+
+
+def _cache_search(search_cache, query: str, scope: str, response: str) -> None:
+    """Store a search response, logging instead of raising on cache failure."""
+    try:
+        search_cache.update(query, scope, [Generation(text=response)])
+    except Exception:
+        logger.warning("Semantic search cache update failed", exc_info=True)
+
+
+# Concurrent page fetches across all sub-agents; also the size of the connection pool
+MAX_CONCURRENT_FETCHES = 8
+_FETCH_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_FETCHES)
+
+# Rate-limited or temporarily unavailable responses are retried with backoff
+RETRY_STATUS_CODES = frozenset({429, 503})
+MAX_FETCH_ATTEMPTS = 3
+MAX_RETRY_DELAY = 10.0
+
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+
+@lru_cache(maxsize=1)
+def _http_client() -> httpx.Client:
+    """Return the shared keep-alive HTTP client used to fetch webpages.
+
+    Reusing one client lets repeated fetches skip the TCP and TLS handshake
+    whenever a connection to the same host is still open.
+    """
+    client = httpx.Client(
+        headers=BROWSER_HEADERS,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=MAX_CONCURRENT_FETCHES,
+            max_keepalive_connections=MAX_CONCURRENT_FETCHES,
+        ),
+    )
+    atexit.register(client.close)
+    return client
+
+
+def ttl_cache(maxsize: int = 128, ttl_seconds: float = 900.0):
+    """Memoize a function like ``lru_cache``, expiring entries after ``ttl_seconds``.
+
+    The cache key includes the current ``time.monotonic() // ttl_seconds`` bucket,
+    so an entry is reused for at most ``ttl_seconds``. Entries of earlier buckets
+    are evicted as soon as a new bucket starts, so expired results are not kept
+    alive until LRU pressure pushes them out. Exceptions are not cached.
+
+    Args:
+        maxsize: Maximum number of cached results
+        ttl_seconds: Maximum age of a cached result in seconds
+
+    Returns:
+        Decorator applying the cache
+    """
+
+    def decorator(func):
+        @lru_cache(maxsize=maxsize)
+        def cached(bucket, *args, **kwargs):
+            return func(*args, **kwargs)
+
+        last_bucket = None
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal last_bucket
+            bucket = int(time.monotonic() // ttl_seconds)
+            if bucket != last_bucket:
+                # Every cached entry belongs to an expired bucket now
+                cached.cache_clear()
+                last_bucket = bucket
+            return cached(bucket, *args, **kwargs)
+
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+
+    return decorator
+
+
+# Pages are truncated after this many bytes to bound download and conversion work
+MAX_PAGE_BYTES = 2_000_000
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Return how long to wait before retrying, honouring a numeric Retry-After."""
+    retry_after = response.headers.get("retry-after", "")
+    if retry_after.isdigit():
+        return min(float(retry_after), MAX_RETRY_DELAY)
+    return min(2**attempt + random.random(), MAX_RETRY_DELAY)
+
+
+BINARY_TYPE_PREFIXES = ("image/", "audio/", "video/", "font/")
+TEXT_APPLICATION_SUBTYPES = ("html", "xml", "json", "javascript")
+
+
+def _is_binary(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type.startswith("application/"):
+        return not any(s in media_type for s in TEXT_APPLICATION_SUBTYPES)
+    return media_type.startswith(BINARY_TYPE_PREFIXES)
+
+
+def _is_html(content_type: str) -> bool:
+    # Servers that omit the header almost always serve HTML
+    return not content_type or "html" in content_type.lower()
+
+
+def _read_page(response: httpx.Response) -> str:
+    """Read up to MAX_PAGE_BYTES of a text response body."""
+    response.raise_for_status()
+    if _is_binary(response.headers.get("content-type", "")):
+        return ""
+
+    buffer = bytearray()
+    for chunk in response.iter_bytes(65536):
+        buffer += chunk
+        if len(buffer) >= MAX_PAGE_BYTES:
+            break
+    return buffer[:MAX_PAGE_BYTES].decode(response.encoding or "utf-8", errors="replace")
+
+
+# Entries can hold up to MAX_PAGE_BYTES of page text, so keep only recent pages
+@ttl_cache(maxsize=32, ttl_seconds=15 * 60)
+def _fetch_markdown(url: str, timeout: float) -> str:
+    for attempt in range(MAX_FETCH_ATTEMPTS):
+        with _FETCH_SLOTS, _http_client().stream("GET", url, timeout=timeout) as response:
+            if (
+                response.status_code not in RETRY_STATUS_CODES
+                or attempt == MAX_FETCH_ATTEMPTS - 1
+            ):
+                content_type = response.headers.get("content-type", "")
+                text = _read_page(response)
+                break
+            delay = _retry_delay(response, attempt)
+        # Back off without holding a fetch slot
+        time.sleep(delay)
+
+    if _is_binary(content_type):
+        return f"Skipped non-text content ({content_type})"
+    return markdownify(text) if _is_html(content_type) else text
+
+
+def _fetch_page(url: str, timeout: float = 10.0) -> tuple[str, bool]:
+    """Return the page markdown, or an error message, and whether the fetch succeeded."""
+    try:
+        return _fetch_markdown(url, timeout), True
+    except Exception as e:
+        return f"Error fetching content from {url}: {str(e)}", False
 
 
 def fetch_webpage_content(url: str, timeout: float = 10.0) -> str:
     """Fetch and convert webpage content to markdown.
 
+    Successful fetches are cached for 15 minutes, so sub-agents that land on
+    the same pages do not download and convert them again.
+
     Args:
         url: URL to fetch
         timeout: Request timeout in seconds
@@ -23,16 +243,7 @@ def fetch_webpage_content(url: str, timeout: float = 10.0) -> str:
     Returns:
         Webpage content as markdown
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-
-    try:
-        response = httpx.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        return markdownify(response.text)
-    except Exception as e:
-        return f"Error fetching content from {url}: {str(e)}"
+    return _fetch_page(url, timeout)[0]
 
 
 @tool(parse_docstring=True)
@@ -55,22 +266,32 @@ def tavily_search(
     Returns:
         Formatted search results with full webpage content
     """
+    # Reuse results of a semantically similar query with the same search options
+    search_cache = _semantic_search_cache()
+    cache_scope = f"tavily_search|{topic}|{max_results}"
+    if search_cache is not None and (
+        cached := _cached_search(search_cache, query, cache_scope)
+    ):
+        return cached
+
     # Use Tavily to discover URLs
-    search_results = tavily_client.search(
+    search_results = _tavily_client().search(
         query,
         max_results=max_results,
         topic=topic,
     )
 
-    # Fetch full content for each URL
-    result_texts = []
+    # Drop duplicate URLs, keeping the first title seen for each
+    titles: dict[str, str] = {}
     for result in search_results.get("results", []):
-        url = result["url"]
-        title = result["title"]
+        titles.setdefault(result["url"], result["title"])
 
-        # Fetch webpage content
-        content = fetch_webpage_content(url)
+    # Fetch full content for all URLs concurrently over the shared client
+    with ThreadPoolExecutor(max_workers=max(len(titles), 1)) as executor:
+        pages = list(executor.map(_fetch_page, titles))
 
+    result_texts = []
+    for (url, title), (content, _) in zip(titles.items(), pages):
         result_text = f"""## {title}
 **URL:** {url}
 
@@ -85,6 +306,10 @@ def tavily_search(
 
 {chr(10).join(result_texts)}"""
 
+    # Like the page cache, never cache errors: they may be gone on the next try
+    if search_cache is not None and pages and all(ok for _, ok in pages):
+        _cache_search(search_cache, query, cache_scope, response)
+
     return response
 
 
@@ -165,3 +390,41 @@ def register_radar_entry(
         f"(risks: {risks})"
     )
 
+
+def tool_schema_digest(tools: tuple[BaseTool, ...]) -> str:
+    """Return a SHA256 fingerprint of the tool schemas sent to the model.
+
+    Args:
+        tools: Tools in the order they are passed to the agent
+
+    Returns:
+        Hex digest of the canonical JSON serialization of the tool schemas
+    """
+    schemas = [convert_to_openai_tool(t) for t in tools]
+    payload = json.dumps(schemas, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Tool schemas are serialized into every model request ahead of the messages, so
+# their order is part of the cached prompt prefix. Keep the sets frozen and
+# sorted by name so refactors cannot silently reorder them.
+RESEARCHER_TOOLS = tuple(
+    sorted((tavily_search, think_tool, register_radar_entry), key=lambda t: t.name)
+)
+ORCHESTRATOR_TOOLS = tuple(sorted((write_markdown_file,), key=lambda t: t.name))
+
+# Update after intentional tool changes; a mismatch means the cached prefix moved,
+# either from an edit here or from a dependency changing schema key order.
+RESEARCHER_TOOLS_DIGEST = "768da7ad06312c5bd104901a397317a052d35529f33bda901274c504d9864e75"
+ORCHESTRATOR_TOOLS_DIGEST = "55ca75e004f9e5c45861666aa9b45a9fe8757e8d80a71331a4ff5b9d364a227e"
+
+for _name, _tools, _digest in (
+    ("RESEARCHER_TOOLS", RESEARCHER_TOOLS, RESEARCHER_TOOLS_DIGEST),
+    ("ORCHESTRATOR_TOOLS", ORCHESTRATOR_TOOLS, ORCHESTRATOR_TOOLS_DIGEST),
+):
+    if tool_schema_digest(_tools) != _digest:
+        warnings.warn(
+            f"{_name} schemas changed; provider prompt caches will miss until "
+            f"{_name}_DIGEST is updated.",
+            stacklevel=1,
+        )